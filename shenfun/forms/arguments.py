@@ -1,5 +1,6 @@
 from numbers import Number, Integral
 import copy
+import functools
 from scipy.special import sph_harm, erf, airy
 import numpy as np
 import sympy as sp
@@ -15,6 +16,24 @@ Ynm = lambda n, m, x, y : sph_harm(m, n, y, x)
 airyai = lambda x: airy(x)[0]
 printwarning = True
 
+@functools.lru_cache(maxsize=128)
+def _lambdify(symbols, expr, special=True):
+    """Return cached numerical function of sympy `expr`
+
+    Parameters
+    ----------
+    symbols : sympy Symbol or tuple of Symbols
+        The arguments of the returned function
+    expr : sympy Expr
+    special : bool, optional
+        Whether to use numpy with the special functions defined in this
+        module, or else sympy's default modules
+    """
+    modules = None
+    if special:
+        modules = ['numpy', {'airyai': airyai, 'cot': cot, 'Ynm': Ynm, 'erf': erf}]
+    return sp.lambdify(symbols, expr, modules=modules)
+
 def Basis(*args, **kwargs): #pragma: no cover
     global printwarning
     import warnings
@@ -362,23 +381,25 @@ class Expr:
     is a vector, the 1 because each vector item contains one term, and the
     final 3 since it is a 3-dimensional tensor product space.
     """
+    __slots__ = ('_basis', '_terms', '_scales', '_indices', '_ndim')
 
     def __init__(self, basis, terms=None, scales=None, indices=None):
         self._basis = basis
         self._terms = terms
         self._scales = scales
         self._indices = indices
-        ndim = self.function_space().dimensions
+        space = basis.function_space()
+        ndim = space.dimensions
+        num_components = space.num_components()
+        self._ndim = ndim
         if terms is None:
-            self._terms = np.zeros((self.function_space().num_components(), 1, ndim),
-                                   dtype=np.int).tolist()
+            self._terms = [[[0]*ndim] for _ in range(num_components)]
         if scales is None:
-            self._scales = np.ones((self.function_space().num_components(), 1), dtype=object).tolist()
+            self._scales = [[1] for _ in range(num_components)]
 
         if indices is None:
-            self._indices = (basis.offset()+np.arange(self.function_space().num_components())[:, np.newaxis]).tolist()
-
-        #assert np.prod(self._scales.shape) == self.num_terms()*self.num_components()
+            offset = basis.offset()
+            self._indices = [[offset+i] for i in range(num_components)]
 
     def basis(self):
         """Return basis of Expr"""
@@ -408,15 +429,17 @@ class Expr:
 
     def expr_rank(self):
         """Return rank of Expr"""
-        if self.dimensions == 1:
-            assert len(self._terms) < 3
-            return len(self._terms)-1
+        ndim = self._ndim
+        num_components = len(self._terms)
+        if ndim == 1:
+            assert num_components < 3
+            return num_components-1
 
-        if len(self._terms) == 1:
+        if num_components == 1:
             return 0
-        if len(self._terms) == len(self._terms[0][0]):
+        if num_components == ndim:
             return 1
-        if len(self._terms) == len(self._terms[0][0])**2:
+        if num_components == ndim**2:
             return 2
 
     @property
@@ -439,13 +462,17 @@ class Expr:
     @property
     def dimensions(self):
         """Return ndim of Expr"""
-        return len(self._terms[0][0])
+        return self._ndim
 
     def index(self):
         if self.num_components() == 1:
             return self._basis.offset()
         return None
 
+    def _is_zero(self):
+        """Return whether all scales of Expr are zero"""
+        return all(sc == 0 for scales in self._scales for sc in scales)
+
     def tolatex(self, symbol_names=None, funcname='u', replace=None):
         s = ""
         x = 'xyzrst'
@@ -647,12 +674,12 @@ class Expr:
                 if not hasattr(sc, 'free_symbols'):
                     sc = float(sc)
                 else:
-                    sym0 = sc.free_symbols
+                    sym0 = tuple(sorted(sc.free_symbols, key=str))
                     m = []
                     for sym in sym0:
                         j = 'xyzrs'.index(str(sym))
                         m.append(x[j])
-                    sc = sp.lambdify(sym0, sc)(*m)
+                    sc = _lambdify(sym0, sc, False)(*m)
                 output_array += sc*work
 
         return output_array
@@ -668,33 +695,33 @@ class Expr:
             basis = self._basis
         if self.expr_rank() == 1:
             return Expr(basis,
-                        [copy.deepcopy(self._terms[i])],
-                        [copy.deepcopy(self._scales[i])],
-                        [copy.deepcopy(self._indices[i])])
+                        [[list(t) for t in self._terms[i]]],
+                        [list(self._scales[i])],
+                        [list(self._indices[i])])
 
         elif self.expr_rank() == 2:
             ndim = self.dimensions
+            sl = slice(i*ndim, (i+1)*ndim)
             return Expr(basis,
-                        copy.deepcopy(self._terms[i*ndim:(i+1)*ndim]),
-                        copy.deepcopy(self._scales[i*ndim:(i+1)*ndim]),
-                        copy.deepcopy(self._indices[i*ndim:(i+1)*ndim]))
+                        [[list(t) for t in terms] for terms in self._terms[sl]],
+                        [list(scales) for scales in self._scales[sl]],
+                        [list(indices) for indices in self._indices[sl]])
         else:
             raise NotImplementedError
 
     def __mul__(self, a):
-        sc = np.array(self.scales())
+        sc = np.array(self._scales, dtype=object)
         assumptions = self.function_space().coors._assumptions
         if self.expr_rank() == 0:
-            sc = sc*sp.sympify(a)
+            sc *= sp.sympify(a)
 
         else:
             if isinstance(a, tuple):
                 assert len(a) == self.num_components()
-                for i in range(self.num_components()):
-                    sc[i] = sc[i]*sp.sympify(a[i])
+                sc *= np.array([sp.sympify(ai) for ai in a], dtype=object)[:, np.newaxis]
 
             else:
-                sc = sc*sp.sympify(a)
+                sc *= sp.sympify(a)
 
         for i in range(sc.shape[0]):
             for j in range(sc.shape[1]):
@@ -706,19 +733,18 @@ class Expr:
         return self.__mul__(a)
 
     def __imul__(self, a):
-        sc = np.array(self.scales())
+        sc = np.array(self._scales, dtype=object)
         assumptions = self.function_space().coors._assumptions
         if self.expr_rank() == 0:
-            sc = sc*sp.sympify(a)
+            sc *= sp.sympify(a)
 
         else:
             if isinstance(a, tuple):
                 assert len(a) == self.dimensions
-                for i in range(self.dimensions):
-                    sc[i] = sc[i]*sp.sympify(a[i])
+                sc *= np.array([sp.sympify(ai) for ai in a], dtype=object)[:, np.newaxis]
 
             else:
-                sc = sc*sp.sympify(a)
+                sc *= sp.sympify(a)
 
         for i in range(sc.shape[0]):
             for j in range(sc.shape[1]):
@@ -733,7 +759,6 @@ class Expr:
         if not isinstance(a, Expr):
             a = Expr(a)
         assert self.num_components() == a.num_components()
-        #assert self.function_space() == a.function_space()
         assert self.argument == a.argument
         if id(self._basis) == id(a._basis):
             basis = self._basis
@@ -741,12 +766,22 @@ class Expr:
             assert id(self._basis.base) == id(a._basis.base)
             basis = self._basis.base
 
+        # Skip concatenation if either Expr is zero
+        if a._is_zero():
+            return Expr(basis, [list(t) for t in self._terms],
+                        [list(s) for s in self._scales],
+                        [list(i) for i in self._indices])
+        if self._is_zero():
+            return Expr(basis, [list(t) for t in a._terms],
+                        [list(s) for s in a._scales],
+                        [list(i) for i in a._indices])
+
         # Concatenate terms
         terms, scales, indices = [], [], []
         for i in range(self.num_components()):
-            terms.append(self._terms[i] + a.terms()[i])
-            scales.append(self._scales[i] + a.scales()[i])
-            indices.append(self._indices[i] + a.indices()[i])
+            terms.append(self._terms[i] + a._terms[i])
+            scales.append(self._scales[i] + a._scales[i])
+            indices.append(self._indices[i] + a._indices[i])
 
         return Expr(basis, terms, scales, indices)
 
@@ -757,10 +792,17 @@ class Expr:
         assert self.num_components() == a.num_components()
         assert self.argument == a.argument
         self._basis = self.base
+        if a._is_zero():
+            return self
+        if self._is_zero():
+            self._terms = [list(t) for t in a._terms]
+            self._scales = [list(s) for s in a._scales]
+            self._indices = [list(i) for i in a._indices]
+            return self
         for i in range(self.num_components()):
-            self._terms[i] += a.terms()[i]
-            self._scales[i] += a.scales()[i]
-            self._indices[i] += a.indices()[i]
+            self._terms[i].extend(a._terms[i])
+            self._scales[i].extend(a._scales[i])
+            self._indices[i].extend(a._indices[i])
         return self
 
     def __sub__(self, a):
@@ -768,7 +810,6 @@ class Expr:
         if not isinstance(a, Expr):
             a = Expr(a)
         assert self.num_components() == a.num_components()
-        #assert self.function_space() == a.function_space()
         assert self.argument == a.argument
         if id(self._basis) == id(a._basis):
             basis = self._basis
@@ -776,12 +817,22 @@ class Expr:
             assert id(self._basis.base) == id(a._basis.base)
             basis = self._basis.base
 
+        # Skip concatenation if either Expr is zero
+        if a._is_zero():
+            return Expr(basis, [list(t) for t in self._terms],
+                        [list(s) for s in self._scales],
+                        [list(i) for i in self._indices])
+        if self._is_zero():
+            return Expr(basis, [list(t) for t in a._terms],
+                        [[-sc for sc in s] for s in a._scales],
+                        [list(i) for i in a._indices])
+
         # Concatenate terms
         terms, scales, indices = [], [], []
         for i in range(self.num_components()):
-            terms.append(self._terms[i] + a.terms()[i])
-            scales.append(self._scales[i] + (-np.array(a.scales()[i])).tolist())
-            indices.append(self._indices[i] + a.indices()[i])
+            terms.append(self._terms[i] + a._terms[i])
+            scales.append(self._scales[i] + [-sc for sc in a._scales[i]])
+            indices.append(self._indices[i] + a._indices[i])
 
         return Expr(basis, terms, scales, indices)
 
@@ -790,7 +841,6 @@ class Expr:
         if not isinstance(a, Expr):
             a = Expr(a)
         assert self.num_components() == a.num_components()
-        assert self.function_space() == a.function_space()
         assert self.argument == a.argument
         if id(self._basis) == id(a._basis):
             basis = self._basis
@@ -798,15 +848,23 @@ class Expr:
             assert id(self._basis.base) == id(a._basis.base)
             basis = self._basis.base
         self._basis = basis
+        if a._is_zero():
+            return self
+        if self._is_zero():
+            self._terms = [list(t) for t in a._terms]
+            self._scales = [[-sc for sc in s] for s in a._scales]
+            self._indices = [list(i) for i in a._indices]
+            return self
         for i in range(self.num_components()):
-            self._terms[i] += a.terms()[i]
-            self._scales[i] += (-np.array(a.scales()[i])).tolist()
-            self._indices[i] += a.indices()[i]
+            self._terms[i].extend(a._terms[i])
+            self._scales[i].extend([-sc for sc in a._scales[i]])
+            self._indices[i].extend(a._indices[i])
 
         return self
 
     def __neg__(self):
-        return Expr(self.basis(), copy.deepcopy(self.terms()), (-np.array(self.scales())).tolist(),
+        return Expr(self.basis(), copy.deepcopy(self.terms()),
+                    [[-sc for sc in scales] for scales in self._scales],
                     copy.deepcopy(self.indices()))
 
     def simplify(self):
@@ -814,36 +872,26 @@ class Expr:
         if np.all(np.array(self.num_terms()) == 1):
             return
 
+        assumptions = self.function_space().coors._assumptions
         tms = []
         inds = []
         scs = []
         for (terms, indices, scales) in zip(self.terms(), self.indices(), self.scales()):
-            tms.append([])
-            inds.append([])
-            scs.append([])
-            for i, (term, ind, sc) in enumerate(zip(terms, indices, scales)):
-                match = []
-                if len(tms[-1]) > 0:
-                    match = np.where((np.array(term) == np.array(tms[-1])).prod(axis=1) == 1)[0]
-                    matchi = np.where( ind == np.array(inds[-1]))[0]
-                    match = np.intersect1d(match, matchi)
-                if len(match) > 0:
-                    k = match[0]
-                    assert inds[-1][k] == ind
-                    scs[-1][k] += sc
-                    scs[-1][k] = sp.simplify(scs[-1][k])
-                    scs[-1][k] = sp.refine(scs[-1][k], self.function_space().coors._assumptions)
-                    if scs[-1][k] == 0: # Remove if scale is zero
-                        scs[-1].pop(k)
-                        tms[-1].pop(k)
-                        inds[-1].pop(k)
-                    continue
-                sc = sp.simplify(sc)
-                sc = sp.refine(sc, self.function_space().coors._assumptions)
-                if not sc == 0:
-                    tms[-1].append(term)
-                    inds[-1].append(ind)
-                    scs[-1].append(sc)
+            # Collect scales of equal (term, index) pairs. Dicts preserve
+            # insertion order, so terms keep their order of appearance
+            d = {}
+            for term, ind, sc in zip(terms, indices, scales):
+                key = (tuple(term), ind)
+                if key in d:
+                    sc = d[key] + sc
+                sc = sp.refine(sp.simplify(sc), assumptions)
+                if sc == 0: # Remove if scale is zero
+                    d.pop(key, None)
+                else:
+                    d[key] = sc
+            tms.append([list(key[0]) for key in d])
+            inds.append([key[1] for key in d])
+            scs.append(list(d.values()))
         self._terms = tms
         self._indices = inds
         self._scales = scs
@@ -1049,14 +1097,16 @@ class ShenfunBaseArray(DistArray):
             if isinstance(buffer, (list, tuple)):
                 assert len(buffer) == len(space.flatten())
                 sympy_buffer = buffer
-                buffer = Array(space)
+                buffer = Array(space, val=None) # Uninitialized, all components are set below
                 dtype = space.forward.input_array.dtype
                 for i, buf0 in enumerate(sympy_buffer):
                     if isinstance(buf0, Number):
                         buffer.v[i] = buf0
                     elif hasattr(buf0, 'free_symbols'):
                         x = buf0.free_symbols.pop()
-                        buffer.v[i] = sp.lambdify(x, buf0)(space.mesh()).astype(dtype)
+                        buffer.v[i] = _lambdify(x, buf0, False)(space.mesh()).astype(dtype)
+                    else:
+                        raise NotImplementedError
 
                 if cls.__name__ == 'Function':
                     buf = Function(space)
@@ -1066,9 +1116,9 @@ class ShenfunBaseArray(DistArray):
             elif hasattr(buffer, 'free_symbols'):
                 # Evaluate sympy function on entire mesh
                 x = buffer.free_symbols.pop()
-                buffer = sp.lambdify(x, buffer)
+                buffer = _lambdify(x, buffer, False)
                 buf = buffer(space.mesh()).astype(space.forward.input_array.dtype)
-                buffer = Array(space)
+                buffer = Array(space, val=None) # Uninitialized, since overwritten
                 buffer.v[:] = buf
                 if cls.__name__ == 'Function':
                     buf = Function(space)
@@ -1102,21 +1152,29 @@ class ShenfunBaseArray(DistArray):
         if isinstance(buffer, (list, tuple)):
             assert len(buffer) == len(space.flatten())
             sympy_buffer = buffer
-            buffer = Array(space)
+            buffer = Array(space, val=None) # Uninitialized, all components are set below
             dtype = space.forward.input_array.dtype
-            if cls.__name__ == 'Function':
-                buff = Function(space)
             mesh = space.local_mesh(True)
+            # Evaluate subexpressions shared by the components only once
+            exprs = [buf0 for buf0 in sympy_buffer
+                     if not isinstance(buf0, Number) and hasattr(buf0, 'free_symbols')]
+            replacements, reduced = sp.cse(exprs, symbols=sp.numbered_symbols('_cse'))
+            values = {}
+            for sym in set().union(*[buf0.free_symbols for buf0 in exprs]):
+                values[sym] = mesh['xyzrs'.index(str(sym))]
+
+            def _eval(expr):
+                sym0 = tuple(sorted(expr.free_symbols, key=str))
+                return _lambdify(sym0, expr)(*[values[sym] for sym in sym0])
+
+            for sym, expr in replacements:
+                values[sym] = _eval(expr)
+            reduced = iter(reduced)
             for i, buf0 in enumerate(sympy_buffer):
                 if isinstance(buf0, Number):
                     buffer.v[i] = buf0
                 elif hasattr(buf0, 'free_symbols'):
-                    sym0 = buf0.free_symbols
-                    m = []
-                    for sym in sym0:
-                        j = 'xyzrs'.index(str(sym))
-                        m.append(mesh[j])
-                    buffer.v[i] = sp.lambdify(sym0, buf0, modules=['numpy', {'airyai': airyai, 'cot': cot, 'Ynm': Ynm, 'erf': erf}])(*m).astype(dtype)
+                    buffer.v[i] = _eval(next(reduced)).astype(dtype)
                 else:
                     raise NotImplementedError
 
@@ -1127,14 +1185,14 @@ class ShenfunBaseArray(DistArray):
 
         # if just one sympy expression
         if hasattr(buffer, 'free_symbols'):
-            sym0 = buffer.free_symbols
+            sym0 = tuple(sorted(buffer.free_symbols, key=str))
             mesh = space.local_mesh(True)
             m = []
             for sym in sym0:
                 j = 'xyzrs'.index(str(sym))
                 m.append(mesh[j])
-            buf = sp.lambdify(sym0, buffer, modules=['numpy', {'airyai': airyai, 'cot': cot, 'Ynm': Ynm, 'erf': erf}])(*m).astype(space.forward.input_array.dtype)
-            buffer = Array(space)
+            buf = _lambdify(sym0, buffer)(*m).astype(space.forward.input_array.dtype)
+            buffer = Array(space, val=None) # Uninitialized, since overwritten
             buffer.v[:] = buf
             if cls.__name__ == 'Function':
                 buf = Function(space)
@@ -1390,12 +1448,13 @@ class Function(ShenfunBaseArray, BasisFunction):
         space = self.function_space()
         if hasattr(kind, 'mesh'):
             if output_array is None:
-                output_array = Array(kind)
+                output_array = Array(kind, val=None)
             output_array = space.backward(self, output_array, kind=kind)
             return output_array
         assert isinstance(kind, str)
+        assert kind.lower() in ('uniform', 'normal')
         if output_array is None:
-            output_array = Array(space)
+            output_array = Array(space, val=None) # Uninitialized, since overwritten
         if kind.lower() == 'uniform':
             output_array = space.backward(self, output_array, kind='uniform')
         elif kind.lower() == 'normal':
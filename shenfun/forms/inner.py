@@ -303,6 +303,8 @@ def inner(expr0, expr1, output_array=None, level=0):
 
     A = []
     gij = testspace.coors.get_covariant_metric_tensor()
+    sg = testspace.coors.get_sqrt_det_g()
+    assumptions = testspace.coors._assumptions
     for vec_i, (base_test, test_ind) in enumerate(zip(test.terms(), test.indices())): # vector/scalar
         for vec_j, (base_trial, trial_ind) in enumerate(zip(trial.terms(), trial.indices())):
             g = 1 if len(test.terms()) == 1 else gij[vec_i, vec_j]
@@ -310,8 +312,9 @@ def inner(expr0, expr1, output_array=None, level=0):
                 continue
             for test_j, b0 in enumerate(base_test):              # second index test
                 for trial_j, b1 in enumerate(base_trial):        # second index trial
-                    dV = sp.simplify(test_scale[vec_i][test_j]*trial_scale[vec_j][trial_j]*testspace.coors.get_sqrt_det_g()*g)
-                    dV = sp.refine(dV, testspace.coors._assumptions)
+                    dV = test_scale[vec_i][test_j]*trial_scale[vec_j][trial_j]*sg*g
+                    if not isinstance(dV, Number):
+                        dV = sp.refine(sp.simplify(dV), assumptions)
                     assert len(b0) == len(b1)
                     trial_sp = trialspace
                     if isinstance(trialspace, (CompositeSpace, MixedFunctionSpace)): # could operate on a vector, e.g., div(u), where u is vector
@@ -332,7 +335,9 @@ def inner(expr0, expr1, output_array=None, level=0):
                             ts = trial_sp[i]
                             tt = test_sp[i]
                             msx = 'xyzrs'[i]
-                            msi = sp.simplify(dv[msx])
+                            msi = dv[msx]
+                            if not isinstance(msi, Number):
+                                msi = sp.simplify(msi)
 
                             # assemble inner product
                             AA = inner_product((tt, a), (ts, b), msi)
@@ -409,6 +414,9 @@ def inner(expr0, expr1, output_array=None, level=0):
     if level == 2 and trial.argument == 1: # No processing of matrices
         return A
 
+    if len(A) == 0: # Form is identically zero, e.g., (v, curl(grad(u)))
+        return A if trial.argument == 1 else output_array
+
     for tpmat in A:
         if isinstance(tpmat, TPMatrix):
             try:
@@ -787,6 +787,8 @@ class SpectralBase:
         self._tensorproductspace = T
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.__class__.__name__ == other.__class__.__name__ and
                 self.quad == other.quad and
                 self.N == other.N and
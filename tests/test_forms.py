@@ -21,21 +21,21 @@ u2 = shenfun.TrialFunction(TT)
 def test_mul(basis):
     e = shenfun.Expr(basis)
     e2 = 2*e
-    assert np.allclose(np.array(e2.scales()).astype(np.int), 2)
+    assert np.allclose(np.array(e2.scales()).astype(int), 2)
     e2 = e*2
-    assert np.allclose(np.array(e2.scales()).astype(np.int), 2.)
+    assert np.allclose(np.array(e2.scales()).astype(int), 2.)
     if e.expr_rank() == 1:
         a = tuple(range(e.dimensions))
         e2 = a*e
-        assert np.allclose(np.array(e2.scales()).astype(np.int)[:, 0], (0, 1))
+        assert np.allclose(np.array(e2.scales()).astype(int)[:, 0], (0, 1))
 
 @pytest.mark.parametrize('basis', (u0, u1, u2))
 def test_imul(basis):
     e = shenfun.Expr(basis)
     e *= 2
-    assert np.allclose(np.array(e.scales()).astype(np.int), 2)
+    assert np.allclose(np.array(e.scales()).astype(int), 2)
     e *= 2
-    assert np.allclose(np.array(e.scales()).astype(np.int), 4)
+    assert np.allclose(np.array(e.scales()).astype(int), 4)
     x = sp.symbols('x', real=True)
     e *= x
     assert np.alltrue(np.array(e.scales()) == 4*x)
@@ -50,20 +50,35 @@ def test_add(basis):
     e2 = shenfun.Expr(basis)
     e3 = e + e2
     assert np.allclose(e3.terms(), np.concatenate((np.array(e.terms()), np.array(e2.terms())), axis=1))
-    assert np.allclose(np.array(e3.scales()).astype(np.int),
-                       np.concatenate((np.array(e.scales()).astype(np.int),
-                                       np.array(e2.scales()).astype(np.int)), axis=1))
+    assert np.allclose(np.array(e3.scales()).astype(int),
+                       np.concatenate((np.array(e.scales()).astype(int),
+                                       np.array(e2.scales()).astype(int)), axis=1))
     assert np.allclose(e3.indices(), np.concatenate((np.array(e.indices()), np.array(e2.indices())), axis=1))
 
+@pytest.mark.parametrize('basis', (u0, u1, u2))
+def test_add_zero(basis):
+    e = shenfun.Expr(basis)
+    for e2 in (e + 0*e, 0*e + e):
+        assert e2.terms() == e.terms()
+        assert e2.scales() == e.scales()
+        assert e2.indices() == e.indices()
+    e2 += e # Result must not share lists with e
+    assert e.num_terms() == [1]*e.num_components()
+    e3 = 0*e
+    e3 += e
+    assert e3.scales() == e.scales()
+    e3 += 0*e
+    assert e3.scales() == e.scales()
+
 @pytest.mark.parametrize('basis', (u0, u1, u2))
 def test_iadd(basis):
     e = shenfun.Expr(basis)
     e2 = shenfun.Expr(basis)
     e += e2
     assert np.allclose(e.terms(), np.concatenate((np.array(e2.terms()), np.array(e2.terms())), axis=1))
-    assert np.allclose(np.array(e.scales()).astype(np.int),
-                       np.concatenate((np.array(e2.scales()).astype(np.int),
-                                       np.array(e2.scales()).astype(np.int)), axis=1))
+    assert np.allclose(np.array(e.scales()).astype(int),
+                       np.concatenate((np.array(e2.scales()).astype(int),
+                                       np.array(e2.scales()).astype(int)), axis=1))
     assert np.allclose(e.indices(), np.concatenate((np.array(e2.indices()), np.array(e2.indices())), axis=1))
 
 @pytest.mark.parametrize('basis', (u0, u1, u2))
@@ -72,23 +87,56 @@ def test_sub(basis):
     e2 = shenfun.Expr(basis)
     e3 = e - e2
     assert np.allclose(e3.terms(), np.concatenate((np.array(e.terms()), np.array(e2.terms())), axis=1))
-    assert np.allclose(np.array(e3.scales()).astype(np.int), np.concatenate((np.array(e.scales()).astype(np.int), -np.array(e2.scales()).astype(np.int)), axis=1))
+    assert np.allclose(np.array(e3.scales()).astype(int), np.concatenate((np.array(e.scales()).astype(int), -np.array(e2.scales()).astype(int)), axis=1))
     assert np.allclose(e3.indices(), np.concatenate((np.array(e.indices()), np.array(e2.indices())), axis=1))
 
+@pytest.mark.parametrize('basis', (u0, u1, u2))
+def test_sub_zero(basis):
+    e = shenfun.Expr(basis)
+    e2 = e - 0*e
+    assert e2.terms() == e.terms()
+    assert e2.scales() == e.scales()
+    e2 = 0*e - e
+    assert e2.terms() == e.terms()
+    assert e2.scales() == (-e).scales()
+    assert e2.indices() == e.indices()
+    e3 = shenfun.Expr(basis)
+    e3 -= 0*e
+    assert e3.scales() == e.scales()
+    e3 = 0*e
+    e3 -= e
+    assert e3.scales() == (-e).scales()
+    assert e.scales() == shenfun.Expr(basis).scales()
+
 @pytest.mark.parametrize('basis', (u0, u1, u2))
 def test_isub(basis):
     e = shenfun.Expr(basis)
     e2 = shenfun.Expr(basis)
     e -= e2
     assert np.allclose(np.array(e.terms()), np.concatenate((np.array(e2.terms()), np.array(e2.terms())), axis=1))
-    assert np.allclose(np.array(e.scales()).astype(np.int), np.concatenate((np.array(e2.scales()).astype(np.int), -np.array(e2.scales()).astype(np.int)), axis=1))
+    assert np.allclose(np.array(e.scales()).astype(int), np.concatenate((np.array(e2.scales()).astype(int), -np.array(e2.scales()).astype(int)), axis=1))
     assert np.allclose(np.array(e.indices()), np.concatenate((np.array(e2.indices()), np.array(e2.indices())), axis=1))
 
 @pytest.mark.parametrize('basis', (u0, u1, u2))
 def test_neg(basis):
     e = shenfun.Expr(basis)
     e2 = -e
-    assert np.allclose(np.array(e.scales()).astype(np.int), (-np.array(e2.scales())).astype(np.int))
+    assert np.allclose(np.array(e.scales()).astype(int), (-np.array(e2.scales())).astype(int))
+
+def test_simplify():
+    B0 = shenfun.FunctionSpace(N, 'C')
+    W = shenfun.VectorSpace(shenfun.TensorProductSpace(comm, (B0, B0)))
+    u = shenfun.TrialFunction(W)
+    x = sp.symbols('x', real=True)
+    e = shenfun.Expr(u,
+                     [[[2, 0], [0, 2], [2, 0], [1, 1], [0, 2], [2, 0], [1, 1], [0, 2]],
+                      [[1, 0], [1, 0]]],
+                     [[1, x, 2, 3, -x, 5, -3, 4], [x, -x]],
+                     [[0, 0, 0, 0, 0, 1, 0, 0], [1, 1]])
+    e.simplify()
+    assert e.terms() == [[[2, 0], [2, 0], [0, 2]], []]
+    assert e.scales() == [[3, 5, 4], []]
+    assert e.indices() == [[0, 1, 0], []]
 
 K0 = shenfun.FunctionSpace(N, 'F', dtype='D')
 K1 = shenfun.FunctionSpace(N, 'F', dtype='D')
@@ -155,6 +203,16 @@ def test_inner():
     inner(curl(h), curl(w))
     inner(h, grad(div(w)))
 
+def test_inner_zero():
+    # curl(grad(u)) simplifies to an Expr without terms
+    v = shenfun.TestFunction(CC)
+    u = shenfun.TrialFunction(C)
+    assert inner(v, curl(grad(u))) == []
+    uh = shenfun.Function(C)
+    uh[:] = np.random.random(uh.shape)
+    wh = inner(v, curl(grad(uh)))
+    assert np.linalg.norm(wh) == 0
+
 def test_tensor2():
     B0 = shenfun.FunctionSpace(8, 'C')
     T = shenfun.TensorProductSpace(comm, (B0, B0))
@@ -172,6 +230,20 @@ def test_tensor2():
     assert np.allclose(g.v[2], 0)
     assert np.allclose(g.v[3], 2)
 
+def test_vector_buffer():
+    B0 = shenfun.FunctionSpace(8, 'C')
+    T = shenfun.TensorProductSpace(comm, (B0, B0))
+    W = shenfun.CompositeSpace([T, T, T, T])
+    x, y = sp.symbols('x,y', real=True)
+    ue = sp.sin(x)*(1-y**2)
+    ua = shenfun.Array(W, buffer=(ue, sp.S(0), ue.diff(x, 2)*y, sp.Float(1.5)))
+    X = T.local_mesh(True)
+    ul = sp.lambdify((x, y), ue)(*X)
+    assert np.allclose(ua.v[0], ul)
+    assert np.allclose(ua.v[1], 0)
+    assert np.allclose(ua.v[2], -ul*X[1])
+    assert np.allclose(ua.v[3], 1.5)
+
 if __name__ == '__main__':
     # test_mul(u2)
     # test_imul(u2)